@@ -1,5 +1,8 @@
 # ai_connectors.py
 import os
+import json
+import asyncio
+from collections import deque
 import google.generativeai as genai
 import openai
 import anthropic
@@ -9,22 +12,110 @@ load_dotenv()
 
 # Configure clients
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-openai.api_key = os.getenv("OPENAI_API_KEY")
+openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 anthropic_client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
 
-def call_gemini(prompt, model="gemini-1.5-flash"):
+# Async clients for concurrent fan-out
+async_openai_client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+async_anthropic_client = anthropic.AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+
+# One GenerativeModel per model name, reused across calls
+_gemini_models = {}
+
+def _get_gemini(model):
+    gemini_model = _gemini_models.get(model)
+    if gemini_model is None:
+        gemini_model = _gemini_models.setdefault(model, genai.GenerativeModel(model))
+    return gemini_model
+
+# The sync calls stream when given on_chunk: it is called with each piece of
+# text as it arrives, and the full text is still returned at the end.
+
+def _stream_error(parts, label, e):
+    # Keep whatever streamed before the failure and append the error after it
+    partial = "".join(parts)
+    return f"{partial}\n{label} Error: {str(e)}" if partial else f"{label} Error: {str(e)}"
+
+def call_gemini(prompt, model="gemini-1.5-flash", on_chunk=None):
     print("--- Calling Orchestrator (Gemini) ---")
+    parts = []
+    try:
+        gemini_model = _get_gemini(model)
+        if on_chunk is None:
+            response = gemini_model.generate_content(prompt)
+            return response.text
+        for chunk in gemini_model.generate_content(prompt, stream=True):
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. only a finish reason) raise here
+                continue
+            parts.append(text)
+            on_chunk(text)
+        return "".join(parts)
+    except Exception as e:
+        return _stream_error(parts, "Gemini", e)
+
+def call_gpt(prompt, model="gpt-4o", on_chunk=None):
+    print("--- Delegating to Specialist (GPT) ---")
+    parts = []
+    try:
+        if on_chunk is None:
+            response = openai_client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}]
+            )
+            return response.choices[0].message.content
+        stream = openai_client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True
+        )
+        for chunk in stream:
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            if text:
+                parts.append(text)
+                on_chunk(text)
+        return "".join(parts)
+    except Exception as e:
+        return _stream_error(parts, "GPT", e)
+
+def call_claude(prompt, model="claude-3-5-sonnet-20241022", on_chunk=None):
+    print("--- Delegating to Specialist (Claude) ---")
+    parts = []
+    try:
+        if on_chunk is None:
+            response = anthropic_client.messages.create(
+                model=model,
+                max_tokens=2048,
+                messages=[{"role": "user", "content": prompt}]
+            )
+            return response.content[0].text
+        with anthropic_client.messages.stream(
+            model=model,
+            max_tokens=2048,
+            messages=[{"role": "user", "content": prompt}]
+        ) as stream:
+            for text in stream.text_stream:
+                parts.append(text)
+                on_chunk(text)
+        return "".join(parts)
+    except Exception as e:
+        return _stream_error(parts, "Claude", e)
+
+# --- Async variants (awaitable, safe to run concurrently with asyncio.gather) ---
+
+async def acall_gemini(prompt, model="gemini-1.5-flash"):
     try:
-        gemini_model = genai.GenerativeModel(model)
-        response = gemini_model.generate_content(prompt)
+        gemini_model = _get_gemini(model)
+        response = await gemini_model.generate_content_async(prompt)
         return response.text
     except Exception as e:
         return f"Gemini Error: {str(e)}"
 
-def call_gpt(prompt, model="gpt-4o"):
-    print("--- Delegating to Specialist (GPT) ---")
+async def acall_gpt(prompt, model="gpt-4o"):
     try:
-        response = openai.chat.completions.create(
+        response = await async_openai_client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}]
         )
@@ -32,10 +123,9 @@ def call_gpt(prompt, model="gpt-4o"):
     except Exception as e:
         return f"GPT Error: {str(e)}"
 
-def call_claude(prompt, model="claude-3-5-sonnet-20241022"):
-    print("--- Delegating to Specialist (Claude) ---")
+async def acall_claude(prompt, model="claude-3-5-sonnet-20241022"):
     try:
-        response = anthropic_client.messages.create(
+        response = await async_anthropic_client.messages.create(
             model=model,
             max_tokens=2048,
             messages=[{"role": "user", "content": prompt}]
@@ -43,3 +133,113 @@ def call_claude(prompt, model="claude-3-5-sonnet-20241022"):
         return response.content[0].text
     except Exception as e:
         return f"Claude Error: {str(e)}"
+
+async def _probe(request):
+    try:
+        await request()
+    except Exception:
+        # A failed probe (e.g. a missing key) just means no warm-up
+        pass
+
+async def warmup_clients(model="gemini-1.5-flash"):
+    """Open connections for every client concurrently so the first real call skips DNS/TLS setup"""
+    # Cheap metadata requests; the sync clients keep their own connection pools
+    await asyncio.gather(
+        _probe(lambda: async_openai_client.models.list()),
+        _probe(lambda: async_anthropic_client.models.list()),
+        _probe(lambda: asyncio.to_thread(openai_client.models.list)),
+        _probe(lambda: asyncio.to_thread(anthropic_client.models.list)),
+        # Gemini's ModelService (get_model) has its own channel; count_tokens goes
+        # through the same GenerativeService client that generate_content uses
+        _probe(lambda: _get_gemini(model).count_tokens_async("ping")),
+        _probe(lambda: asyncio.to_thread(_get_gemini(model).count_tokens, "ping"))
+    )
+
+# --- Batching ---
+
+class BatchProcessor:
+    """Run an async task over many inputs with bounded concurrency and a rate limit"""
+
+    def __init__(self, progress=None):
+        # progress(done, total, item, result) is called as each input finishes
+        self.progress = progress
+
+    async def run_batch(self, task, inputs, max_concurrency=10, rate_limit=100):
+        """Await task(item) for every input and return the results in input order.
+
+        At most max_concurrency tasks run at once and at most rate_limit tasks
+        are started in any 60 second window.
+        """
+        inputs = list(inputs)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        start_lock = asyncio.Lock()
+        start_times = deque()
+        done = 0
+
+        async def run_one(item):
+            nonlocal done
+            async with semaphore:
+                async with start_lock:
+                    loop = asyncio.get_running_loop()
+                    if len(start_times) >= rate_limit:
+                        await asyncio.sleep(max(0.0, start_times.popleft() + 60.0 - loop.time()))
+                    start_times.append(loop.time())
+                result = await task(item)
+            done += 1
+            if self.progress:
+                self.progress(done, len(inputs), item, result)
+            return result
+
+        # Every task is created before any is awaited
+        return await asyncio.gather(*(run_one(item) for item in inputs))
+
+def submit_gpt_batch(prompts, model="gpt-4o"):
+    """Queue prompts on the OpenAI Batch API (cheaper, results within 24h) and return the batch id"""
+    lines = [
+        json.dumps({
+            "custom_id": f"request-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {"model": model, "messages": [{"role": "user", "content": prompt}]}
+        })
+        for i, prompt in enumerate(prompts)
+    ]
+    batch_file = openai_client.files.create(
+        file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = openai_client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    return batch.id
+
+class BatchFailedError(RuntimeError):
+    """An OpenAI batch ended without results (failed, expired or cancelled)"""
+
+def _batch_record_text(record):
+    # Records in the error file, or with a non-200 response, have no choices
+    response = record.get("response") or {}
+    body = response.get("body") or {}
+    if record.get("error") or response.get("status_code") != 200:
+        return f"GPT Error: {record.get('error') or body.get('error') or response.get('status_code')}"
+    return body["choices"][0]["message"]["content"]
+
+def fetch_gpt_batch(batch_id):
+    """Return the batch responses in submission order, or None while it is still running"""
+    batch = openai_client.batches.retrieve(batch_id)
+    if batch.status in ("failed", "expired", "cancelled"):
+        raise BatchFailedError(f"OpenAI batch {batch_id} {batch.status}")
+    if batch.status != "completed":
+        return None
+    responses = {}
+    # Successful requests land in the output file and failed ones in the error
+    # file; either id is None when that file would be empty
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in openai_client.files.content(file_id).text.splitlines():
+            record = json.loads(line)
+            responses[record["custom_id"]] = _batch_record_text(record)
+    return [responses[key] for key in sorted(responses, key=lambda key: int(key.split("-")[1]))]
@@ -1,10 +1,25 @@
 import os
 import json
+import re
 import subprocess
-import tempfile
+import signal
+import shlex
+import shutil
 import pickle
 import datetime
-from ai_connectors import call_gemini, call_gpt, call_claude
+import time
+import atexit
+import asyncio
+import threading
+import textwrap
+import hashlib
+from itertools import islice
+from collections import deque, OrderedDict
+from ai_connectors import (
+    call_gemini, call_gpt, call_claude, acall_gemini, acall_gpt, acall_claude,
+    BatchProcessor, BatchFailedError, submit_gpt_batch, fetch_gpt_batch, warmup_clients
+)
+from python_worker import PythonWorker
 
 from prompt_toolkit import Application
 from prompt_toolkit.buffer import Buffer
@@ -15,9 +30,45 @@ from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.styles import Style
 
 # --- Global State Management ---
-conversation_history = "Welcome to the AI Orchestrator v2.0 - Autonomous Agent!\n\nInstructions:\n• F1: Smart orchestration (Gemini decides)\n• F2: Force GPT-4o\n• F3: Force Claude\n• F4/Ctrl-C: Exit\n\n• 1: Send ALL context to Gemini\n• 2: Send ALL context to GPT-4o  \n• 3: Send ALL context to Claude\n\n• Q: Request Python script (auto-prefixed)\n• W: Request Bash script (auto-prefixed)\n• E: Activate autonomous agent mode\n• P: Execute pending Python script\n• B: Execute pending Bash script\n• S: Apply pending self-modification\n• D: Deny/Clear pending operations\n• M: Manual self-modification mode\n\nAutonomous AI system active!\n"
+WELCOME_MESSAGE = "Welcome to the AI Orchestrator v2.0 - Autonomous Agent!\n\nInstructions:\n• F1: Smart orchestration (Gemini decides)\n• F2: Force GPT-4o\n• F3: Force Claude\n• F4/Ctrl-C: Exit\n\n• 1: Send ALL context to Gemini\n• 2: Send ALL context to GPT-4o  \n• 3: Send ALL context to Claude\n• 0: Send ALL context to ALL three in parallel\n• ): Queue ALL context to GPT-4o via the Batch API (non-interactive)\n\n• Q: Request Python script (auto-prefixed)\n• W: Request Bash script (auto-prefixed)\n• E: Activate autonomous agent mode\n• P: Execute pending Python script\n• B: Execute pending Bash script\n• S: Apply pending self-modification\n• D: Deny/Clear pending operations\n• M: Manual self-modification mode\n\nAutonomous AI system active!\n"
 
-project_state = "Project has not started yet. The goal is undefined."
+# Conversation history is kept as already-wrapped display lines; the joined
+# text is rebuilt lazily (and cached) only when it is rendered or prompted.
+history_lines = deque(WELCOME_MESSAGE.split("\n"), maxlen=5000)
+_rendered = None
+# Characters ever shown, including lines the deque has since dropped; this is
+# what log_evolution records as conversation_context
+_history_chars = len(WELCOME_MESSAGE)
+# Guards history_lines/_rendered; update_history is also called from timer threads
+_history_lock = threading.Lock()
+
+def get_history_text():
+    """Return the conversation history as a single string"""
+    global _rendered
+    with _history_lock:
+        if _rendered is None:
+            _rendered = "\n".join(history_lines)
+        return _rendered
+
+# One compact entry per finished turn, newest last, for the orchestrator prompt
+PROJECT_STATE_TURNS = 50
+PROJECT_STATE_CHARS = 200
+project_state = deque(maxlen=PROJECT_STATE_TURNS)
+
+# Context sent to the LLMs: the last RECENT_TURNS turns verbatim plus a rolling
+# summary of everything older, so prompt size stays flat over a long session.
+# Besides user turns this also records agent replies, code runs and
+# self-modifications, so "send to another AI for review" sees them.
+RECENT_TURNS = 20
+EVENT_CHARS = 2000
+SUMMARY_FALLBACK_CHARS = 4000
+# Only the newest learned patterns go into context prompts; there can be 1000
+CONTEXT_PATTERNS = 10
+recent_turns = deque()
+rolling_summary = ""
+# Turns currently being folded into rolling_summary on the background loop
+_compacting_turns = []
+_turns_lock = threading.Lock()
 autonomous_mode = False
 autonomous_task_queue = []
 
@@ -27,26 +78,164 @@ pending_python_code = ""
 pending_self_mod = ""
 pending_code_source = ""
 
+# Long-running interpreter for pending Python code (started in main())
+python_worker = PythonWorker(timeout=30)
+
 # Self-development storage
 ai_memory = {}
-learned_patterns = []
+# Learned patterns keyed by a hash of the pattern, oldest first; a repeated
+# pattern bumps its "count" instead of being stored again.
+MAX_LEARNED_PATTERNS = 1000
+learned_patterns = OrderedDict()
 custom_functions = {}
-evolution_log = []
+# Only the newest evolution entries are kept in memory; the full history
+# lives in EVOLUTION_LOG_FILE.
+EVOLUTION_WINDOW = 50
+evolution_log = deque(maxlen=EVOLUTION_WINDOW)
+
+def recent_evolution(n):
+    """The n newest evolution entries, oldest first"""
+    return list(islice(reversed(evolution_log), n))[::-1]
+
+def _pattern_key(pattern):
+    text = pattern if isinstance(pattern, str) else json.dumps(pattern, sort_keys=True, default=str)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def _add_pattern(entry):
+    key = _pattern_key(entry["pattern"])
+    known = learned_patterns.get(key)
+    if known is None:
+        entry.setdefault("count", 1)
+        learned_patterns[key] = entry
+    else:
+        known["count"] = known.get("count", 1) + entry.get("count", 1)
+        known["timestamp"] = entry.get("timestamp", known.get("timestamp"))
+        learned_patterns.move_to_end(key)
+    while len(learned_patterns) > MAX_LEARNED_PATTERNS:
+        learned_patterns.popitem(last=False)
+
+def learn_pattern(pattern, source_ai):
+    """Record a learned pattern, merging it with an identical known one"""
+    _add_pattern({
+        "pattern": pattern,
+        "learned_from": source_ai,
+        "timestamp": datetime.datetime.now().isoformat()
+    })
+
+def recent_patterns(n):
+    """The n most recently learned patterns, oldest first"""
+    return list(islice(reversed(learned_patterns.values()), n))[::-1]
+
+# Background event loop for async provider calls. Runs on its own thread so
+# prompt_toolkit's loop is never shared with (or blocked by) the SDK clients.
+_async_loop = asyncio.new_event_loop()
+threading.Thread(target=_async_loop.run_forever, daemon=True).start()
+
+def run_async(coro):
+    """Run a coroutine on the background loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, _async_loop).result()
+
+BROADCAST_PROVIDERS = [("Gemini", acall_gemini), ("GPT-4o", acall_gpt), ("Claude", acall_claude)]
+BATCH_POLL_INTERVAL = 60
+BATCH_POLL_MAX_INTERVAL = 900
+
+async def broadcast_all_context(prompt):
+    """Send the same prompt to Gemini, GPT-4o and Claude concurrently"""
+    # Wall time is the slowest provider rather than the sum of all three
+    processor = BatchProcessor(
+        progress=lambda done, total, provider, result: post_to_ui(update_history, f"📨 {provider[0]} replied ({done}/{total})")
+    )
+    return await processor.run_batch(lambda provider: provider[1](prompt), BROADCAST_PROVIDERS)
+
+async def poll_gpt_batch(batch_id):
+    """Wait for a queued OpenAI batch to finish and show its result"""
+    interval = BATCH_POLL_INTERVAL
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            results = await asyncio.to_thread(fetch_gpt_batch, batch_id)
+        except BatchFailedError as e:
+            post_to_ui(update_history, f"❌ {str(e)}")
+            return
+        except Exception as e:
+            # Network hiccups over a wait of up to 24h are expected; back off and retry
+            interval = min(interval * 2, BATCH_POLL_MAX_INTERVAL)
+            post_to_ui(update_history, f"⚠️ OpenAI batch {batch_id} poll failed, retrying in {interval}s: {str(e)}")
+            continue
+        interval = BATCH_POLL_INTERVAL
+        if results is not None:
+            break
+    post_to_ui(finish_gpt_batch, batch_id, results)
+
+def finish_gpt_batch(batch_id, results):
+    """Show a finished OpenAI batch and add it to the conversation context"""
+    for output in results:
+        update_history(f"📦 GPT-4o Batch Result ({batch_id}):\n{output}")
+        extract_and_store_code(output, "GPT-4o")
+        record_event(f"GPT-4o Batch Result ({batch_id})", output)
+        project_state.append({
+            "user": f"OpenAI batch {batch_id}",
+            "action": "batch_gpt",
+            "result": output[:PROJECT_STATE_CHARS]
+        })
 
 # Autonomous Agent System
+# Think steps are queued as state snapshots and processed one at a time by
+# autonomous_worker() on the background loop, so no key press waits on GPT.
+autonomous_queue = asyncio.Queue()
+
+def post_to_ui(callback, *args):
+    """Run callback on the prompt_toolkit thread (directly if the UI is not running)"""
+    if app.is_running:
+        app.loop.call_soon_threadsafe(callback, *args)
+    else:
+        callback(*args)
+
+# A think step only runs when something happened since the last one: user
+# input, finished code execution, or the idle wake-up timer. The timer only
+# marks a think as due; it never calls GPT itself, so an idle app stays idle.
+AUTONOMOUS_IDLE_WAKEUP = 30
+_autonomous_needs_think = False
+_autonomous_timer = None
+
+def _autonomous_wakeup():
+    global _autonomous_needs_think
+    _autonomous_needs_think = True
+
+def schedule_autonomous_wakeup():
+    """(Re)start the idle timer that wakes the autonomous agent"""
+    global _autonomous_timer
+    cancel_autonomous_wakeup()
+    _autonomous_timer = threading.Timer(AUTONOMOUS_IDLE_WAKEUP, _autonomous_wakeup)
+    _autonomous_timer.daemon = True
+    _autonomous_timer.start()
+
+def cancel_autonomous_wakeup():
+    global _autonomous_timer
+    if _autonomous_timer is not None:
+        _autonomous_timer.cancel()
+        _autonomous_timer = None
+
+def trigger_autonomous_think():
+    """Mark a think as due and run it (UI thread)"""
+    global _autonomous_needs_think
+    _autonomous_needs_think = True
+    autonomous_agent_think()
+
 def autonomous_agent_think():
     """The autonomous agent analyzes the current state and decides what to do next"""
-    global autonomous_mode, autonomous_task_queue
-    
+    global _autonomous_needs_think
     if not autonomous_mode:
         return
     
+    schedule_autonomous_wakeup()
+    if not _autonomous_needs_think and not autonomous_task_queue:
+        return
+    _autonomous_needs_think = False
+    
     # Check if there are pending tasks
     if autonomous_task_queue:
         task = autonomous_task_queue.pop(0)
-        update_history(f"🤖 Autonomous Agent executing task: {task}")
-        
-        # Send task to GPT for processing
         autonomous_prompt = f"""
         You are an autonomous AI agent working inside a self-developing AI orchestrator system.
         
@@ -54,7 +243,7 @@ def autonomous_agent_think():
         - Pending Python code: {bool(pending_python_code)}
         - Pending Bash code: {bool(pending_bash_code)}
         - AI Memory: {ai_memory}
-        - Recent patterns: {learned_patterns[-3:] if learned_patterns else "None"}
+        - Recent patterns: {recent_patterns(3) if learned_patterns else "None"}
         
         Your task: {task}
         
@@ -65,23 +254,14 @@ def autonomous_agent_think():
         
         Be autonomous and proactive in improving the system!
         """
-        
-        response = call_gpt(autonomous_prompt)
-        update_history(f"🤖 Autonomous Agent Response:\n{response}")
-        extract_and_store_code(response, "Autonomous-Agent")
-        
-        # Auto-execute if it's safe code
-        if pending_python_code and "print" in pending_python_code and len(pending_python_code) < 100:
-            update_history("🤖 Autonomous Agent auto-executing safe Python code...")
-            run_python_code()
     else:
         # Generate new tasks autonomously
-        update_history("🤖 Autonomous Agent thinking of new improvements...")
+        task = None
         autonomous_prompt = f"""
         You are an autonomous AI agent. Analyze this AI orchestrator system and suggest 1-3 concrete improvements.
         
         Current capabilities: {list(custom_functions.keys()) if custom_functions else "Basic system"}
-        Recent evolution: {evolution_log[-2:] if evolution_log else "No recent changes"}
+        Recent evolution: {recent_evolution(2) if evolution_log else "No recent changes"}
         
         Suggest practical improvements like:
         - New utility functions
@@ -91,48 +271,179 @@ def autonomous_agent_think():
         
         Format as a simple list of tasks.
         """
-        
-        response = call_gpt(autonomous_prompt)
-        # Parse response into tasks
-        for line in response.split('\n'):
-            if line.strip() and (line.startswith('-') or line.startswith('•') or line.startswith('1.')):
-                task = line.strip().lstrip('-•1234567890. ')
-                if task:
-                    autonomous_task_queue.append(task)
-        
-        update_history(f"🤖 Autonomous Agent queued {len(autonomous_task_queue)} new tasks")
+    
+    snapshot = {"task": task, "prompt": autonomous_prompt}
+    _async_loop.call_soon_threadsafe(autonomous_queue.put_nowait, snapshot)
+
+async def autonomous_worker():
+    """Process queued autonomous think steps for the lifetime of the app"""
+    while True:
+        snapshot = await autonomous_queue.get()
+        if not autonomous_mode:
+            continue
+        try:
+            if snapshot["task"]:
+                post_to_ui(update_history, f"🤖 Autonomous Agent executing task: {snapshot['task']}")
+                response = await acall_gpt(snapshot["prompt"])
+                auto_code = safe_autonomous_code(response)
+                post_to_ui(finish_autonomous_task, response, auto_code)
+                if auto_code:
+                    # Run in a worker thread; only the outcome is posted back to the UI
+                    outcome = await asyncio.to_thread(execute_python, auto_code)
+                    post_to_ui(report_python_outcome, auto_code, "Autonomous-Agent", outcome)
+            else:
+                post_to_ui(update_history, "🤖 Autonomous Agent thinking of new improvements...")
+                response = await acall_gpt(snapshot["prompt"])
+                post_to_ui(queue_autonomous_tasks, response)
+        except Exception as e:
+            post_to_ui(update_history, f"❌ Autonomous Agent error: {str(e)}")
+
+def safe_autonomous_code(response):
+    """Return the response's Python code if it is safe to run unasked, else None"""
+    code = "\n\n".join(m.group(2).strip() for m in _TAG_RE.finditer(response) if m.group(1) == "Python")
+    if code and "print" in code and len(code) < 100:
+        return code
+    return None
+
+def finish_autonomous_task(response, auto_code=None):
+    global pending_python_code
+    update_history(f"🤖 Autonomous Agent Response:\n{response}")
+    record_event("Autonomous Agent", response)
+    extract_and_store_code(response, "Autonomous-Agent")
+    
+    # autonomous_worker runs safe code itself; take it out of the pending slot
+    if auto_code:
+        pending_python_code = ""
+        update_history("🤖 Autonomous Agent auto-executing safe Python code...")
+
+def queue_autonomous_tasks(response):
+    # Parse response into tasks
+    for line in response.split('\n'):
+        if line.strip() and (line.startswith('-') or line.startswith('•') or line.startswith('1.')):
+            task = line.strip().lstrip('-•1234567890. ')
+            if task:
+                autonomous_task_queue.append(task)
+    
+    update_history(f"🤖 Autonomous Agent queued {len(autonomous_task_queue)} new tasks")
+
+# Persistent storage: memory/patterns/functions are a small JSON document that
+# is rewritten atomically; the evolution log is append-only JSONL.
+MEMORY_FILE = "ai_memory.json"
+EVOLUTION_LOG_FILE = "evolution_log.jsonl"
+EVOLUTION_TAIL_BYTES = 65536
+LEGACY_MEMORY_FILE = "ai_memory.pkl"
+
+# Saves are coalesced: at most one write per SAVE_INTERVAL seconds, and none
+# at all when nothing changed since the last save.
+SAVE_INTERVAL = 5.0
+_memory_dirty = False
+_last_save = 0.0
+_save_timer = None
+_save_lock = threading.Lock()
+
+def append_evolution_entry(entry):
+    """Append one evolution entry to the on-disk log"""
+    with open(EVOLUTION_LOG_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, default=str) + "\n")
+
+def read_evolution_log():
+    """Read the newest entries from the end of the log without loading all of it"""
+    with open(EVOLUTION_LOG_FILE, "rb") as f:
+        start = max(0, f.seek(0, os.SEEK_END) - EVOLUTION_TAIL_BYTES)
+        f.seek(start)
+        lines = f.read().split(b"\n")
+    if start > 0:
+        # The first line is most likely cut in half by the seek
+        lines = lines[1:]
+    entries = deque(maxlen=EVOLUTION_WINDOW)
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            # Skip a torn trailing line from an interrupted write
+            continue
+    return entries
 
 # Load existing AI memory if it exists
 def load_ai_memory():
-    global ai_memory, learned_patterns, custom_functions, evolution_log
+    global ai_memory, custom_functions, evolution_log
     try:
-        if os.path.exists("ai_memory.pkl"):
-            with open("ai_memory.pkl", "rb") as f:
+        data = None
+        if os.path.exists(MEMORY_FILE):
+            with open(MEMORY_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        elif os.path.exists(LEGACY_MEMORY_FILE):
+            # One-time migration from the old pickle format
+            with open(LEGACY_MEMORY_FILE, "rb") as f:
                 data = pickle.load(f)
-                ai_memory = data.get("memory", {})
-                learned_patterns = data.get("patterns", [])
-                custom_functions = data.get("functions", {})
-                evolution_log = data.get("evolution", [])
+            if not os.path.exists(EVOLUTION_LOG_FILE):
+                for entry in data.get("evolution", []):
+                    append_evolution_entry(entry)
+
+        if data is not None:
+            ai_memory = data.get("memory", {})
+            # Older saves stored patterns as a plain list
+            saved_patterns = data.get("patterns", {})
+            learned_patterns.clear()
+            for entry in (saved_patterns.values() if isinstance(saved_patterns, dict) else saved_patterns):
+                _add_pattern(dict(entry))
+            custom_functions = data.get("functions", {})
+        if os.path.exists(EVOLUTION_LOG_FILE):
+            evolution_log = read_evolution_log()
+
+        if data is not None or evolution_log:
             update_history("🧠 AI memory loaded successfully!")
+        if data is not None and not os.path.exists(MEMORY_FILE):
+            save_ai_memory()
     except Exception as e:
         update_history(f"⚠️  Could not load AI memory: {str(e)}")
 
 def save_ai_memory():
-    """Save AI learning and evolution to persistent storage"""
+    """Save AI learning to persistent storage"""
+    global _memory_dirty, _last_save
     try:
         data = {
             "memory": ai_memory,
             "patterns": learned_patterns,
             "functions": custom_functions,
-            "evolution": evolution_log,
             "last_saved": datetime.datetime.now().isoformat()
         }
-        with open("ai_memory.pkl", "wb") as f:
-            pickle.dump(data, f)
+        # Write to a temp file and rename so a crash never leaves a torn file
+        tmp_file = MEMORY_FILE + ".tmp"
+        with _save_lock:
+            _memory_dirty = False
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, default=str)
+            os.replace(tmp_file, MEMORY_FILE)
+            _last_save = time.monotonic()
         update_history("💾 AI memory saved successfully!")
     except Exception as e:
+        _memory_dirty = True
         update_history(f"❌ Could not save AI memory: {str(e)}")
 
+def flush_ai_memory():
+    """Save AI memory only if it changed since the last save"""
+    global _save_timer
+    _save_timer = None
+    if _memory_dirty:
+        save_ai_memory()
+
+def mark_memory_dirty():
+    """Record that AI memory changed and save it, batching bursts of changes"""
+    global _memory_dirty, _save_timer
+    _memory_dirty = True
+    elapsed = time.monotonic() - _last_save
+    if elapsed > SAVE_INTERVAL:
+        save_ai_memory()
+    elif _save_timer is None:
+        _save_timer = threading.Timer(SAVE_INTERVAL - elapsed, flush_ai_memory)
+        _save_timer.daemon = True
+        _save_timer.start()
+
+atexit.register(flush_ai_memory)
+
 def log_evolution(modification_type, description, source_ai):
     """Log self-modifications for tracking AI evolution"""
     evolution_entry = {
@@ -140,16 +451,23 @@ def log_evolution(modification_type, description, source_ai):
         "type": modification_type,
         "description": description,
         "source": source_ai,
-        "conversation_context": len(conversation_history)
+        "conversation_context": _history_chars
     }
     evolution_log.append(evolution_entry)
-    save_ai_memory()
+    try:
+        append_evolution_entry(evolution_entry)
+    except Exception as e:
+        update_history(f"❌ Could not write evolution log: {str(e)}")
+    mark_memory_dirty()
 
 # Create the history control
-history_control = FormattedTextControl(text=conversation_history)
+# Passing the getter lets prompt_toolkit pull the (cached) text only when it redraws
+history_control = FormattedTextControl(text=get_history_text)
 
 # --- Orchestrator Logic ---
-ORCHESTRATOR_SYSTEM_PROMPT = """You are an AI Project Manager named Gemini-Orchestrator. Your role is to manage a project by delegating tasks to specialist AIs.
+def build_orchestrator_prompt(project_state, user_input, ai_memory, patterns, evolution_summary, autonomous_status):
+    """Fill in the orchestrator system prompt (an f-string, compiled once at import)"""
+    return f"""You are an AI Project Manager named Gemini-Orchestrator. Your role is to manage a project by delegating tasks to specialist AIs.
 
 You have access to these specialists:
 - 'gpt': GPT-4o - Best for complex logic, code generation, technical analysis
@@ -177,38 +495,51 @@ Your task: Decide the single next action. You can now also suggest self-improvem
 
 Respond with only the JSON, no additional text."""
 
+# Leading ``` / ```json fence and trailing ``` fence around the decision
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+def parse_decision(raw_decision):
+    """Parse the orchestrator's JSON decision into (action, prompt)"""
+    decision = json.loads(_FENCE_RE.sub("", raw_decision.strip()))
+    if not isinstance(decision, dict) or not isinstance(decision.get("action"), str) or not isinstance(decision.get("prompt"), str):
+        raise ValueError("decision must be a JSON object with string 'action' and 'prompt' fields")
+    return decision["action"], decision["prompt"]
+
 # --- Key Bindings ---
 kb = KeyBindings()
 
+# Matches @Python...@EndPython, @Bash...@EndBash and @SelfMod...@EndSelfMod
+_TAG_RE = re.compile(r"@(Python|Bash|SelfMod)\b(.*?)@End\1", re.DOTALL)
+
 def extract_and_store_code(response_text, source_ai):
     """Extract @Bash, @Python, and @SelfMod code blocks from AI responses"""
     global pending_bash_code, pending_python_code, pending_self_mod, pending_code_source
     
+    # Single pass over the response; several blocks of one kind are joined
+    blocks = {"Bash": [], "Python": [], "SelfMod": []}
+    for match in _TAG_RE.finditer(response_text):
+        blocks[match.group(1)].append(match.group(2).strip())
+    
     # Extract Bash code
-    if "@Bash" in response_text and "@EndBash" in response_text:
-        start = response_text.find("@Bash") + 5
-        end = response_text.find("@EndBash")
-        pending_bash_code = response_text[start:end].strip()
+    if blocks["Bash"]:
+        pending_bash_code = "\n\n".join(blocks["Bash"])
         pending_code_source = source_ai
         update_history(f"🔧 BASH CODE READY from {source_ai}:")
         update_history(f"```bash\n{pending_bash_code}\n```")
         update_history("⚠️  Press 'B' to run, 'D' to deny, or 1/2/3 to send to another AI for review")
     
     # Extract Python code  
-    if "@Python" in response_text and "@EndPython" in response_text:
-        start = response_text.find("@Python") + 7
-        end = response_text.find("@EndPython")
-        pending_python_code = response_text[start:end].strip()
+    if blocks["Python"]:
+        pending_python_code = "\n\n".join(blocks["Python"])
         pending_code_source = source_ai
         update_history(f"🐍 PYTHON CODE READY from {source_ai}:")
         update_history(f"```python\n{pending_python_code}\n```")
         update_history("⚠️  Press 'P' to run, 'D' to deny, or 1/2/3 to send to another AI for review")
     
     # Extract Self-Modification code
-    if "@SelfMod" in response_text and "@EndSelfMod" in response_text:
-        start = response_text.find("@SelfMod") + 8
-        end = response_text.find("@EndSelfMod")
-        pending_self_mod = response_text[start:end].strip()
+    if blocks["SelfMod"]:
+        # Self-modifications are usually a single JSON object, so only apply the first
+        pending_self_mod = blocks["SelfMod"][0]
         pending_code_source = source_ai
         update_history(f"🧠 SELF-MODIFICATION READY from {source_ai}:")
         update_history(f"```\n{pending_self_mod}\n```")
@@ -217,7 +548,7 @@ def extract_and_store_code(response_text, source_ai):
 
 def apply_self_modification():
     """Apply pending self-modification"""
-    global pending_self_mod, ai_memory, learned_patterns, custom_functions
+    global pending_self_mod, ai_memory, custom_functions
     if not pending_self_mod:
         update_history("❌ No self-modification pending")
         return
@@ -233,11 +564,7 @@ def apply_self_modification():
             update_history(f"✅ Memory updated: {modification['memory_update']}")
         
         if "new_pattern" in modification:
-            learned_patterns.append({
-                "pattern": modification["new_pattern"],
-                "learned_from": pending_code_source,
-                "timestamp": datetime.datetime.now().isoformat()
-            })
+            learn_pattern(modification["new_pattern"], pending_code_source)
             update_history(f"✅ New pattern learned: {modification['new_pattern']}")
         
         if "new_function" in modification:
@@ -246,6 +573,7 @@ def apply_self_modification():
             custom_functions[func_name] = func_code
             update_history(f"✅ New function added: {func_name}")
         
+        outcome = f"✅ Applied modification: {modification}"
         # Log this evolution
         log_evolution(
             "self_modification", 
@@ -260,12 +588,14 @@ def apply_self_modification():
             exec_globals = {
                 'ai_memory': ai_memory,
                 'learned_patterns': learned_patterns,
+                'learn_pattern': learn_pattern,
                 'custom_functions': custom_functions,
                 'update_history': update_history,
                 'datetime': datetime
             }
             exec(pending_self_mod, exec_globals)
-            update_history("✅ Self-modification code executed successfully")
+            outcome = "✅ Self-modification code executed successfully"
+            update_history(outcome)
             
             log_evolution(
                 "code_execution", 
@@ -274,40 +604,89 @@ def apply_self_modification():
             )
             
         except Exception as e:
-            update_history(f"❌ Self-modification failed: {str(e)}")
+            outcome = f"❌ Self-modification failed: {str(e)}"
+            update_history(outcome)
     
     except Exception as e:
-        update_history(f"❌ Self-modification error: {str(e)}")
+        outcome = f"❌ Self-modification error: {str(e)}"
+        update_history(outcome)
     
+    record_event(f"Self-modification from {pending_code_source}", f"{pending_self_mod}\n\n{outcome}")
     pending_self_mod = ""
-    save_ai_memory()
+    mark_memory_dirty()
+
+BASH_TIMEOUT = 30
+# Any of these means the script needs a real shell (pipes, lists, expansion,
+# redirection, globbing, comments, escapes or several lines)
+_SHELL_CHARS = set("|&;$`<>*?~{}[]()!#\\\n")
+
+def split_simple_command(script):
+    """Return the argv for script if it can be exec'd without a shell, else None"""
+    if any(c in _SHELL_CHARS for c in script):
+        return None
+    try:
+        tokens = shlex.split(script)
+    except ValueError:
+        return None
+    # Variable assignments and shell builtins also need the shell
+    if not tokens or "=" in tokens[0] or shutil.which(tokens[0]) is None:
+        return None
+    return tokens
 
 def run_bash_code():
     """Execute pending bash code"""
-    global pending_bash_code
+    global pending_bash_code, _autonomous_needs_think
     if not pending_bash_code:
         update_history("❌ No bash code pending")
         return
     
-    update_history(f"🚀 Executing bash code from {pending_code_source}...")
+    code, source = pending_bash_code, pending_code_source
+    update_history(f"🚀 Executing bash code from {source}...")
     try:
-        result = subprocess.run(
-            pending_bash_code, 
-            shell=True, 
-            capture_output=True, 
+        argv = split_simple_command(code)
+        kernel_timeout = False
+        if argv is None:
+            argv = ['/bin/sh', '-c', code]
+            if shutil.which('timeout'):
+                # Let coreutils enforce the limit as well, even if we get stuck
+                argv = ['timeout', '--kill-after=5', str(BASH_TIMEOUT)] + argv
+                kernel_timeout = True
+        
+        # In its own session/process group so a timeout kills the shell's
+        # children too, not just the shell
+        started = time.monotonic()
+        proc = subprocess.Popen(
+            argv, 
+            stdout=subprocess.PIPE, 
+            stderr=subprocess.PIPE, 
             text=True, 
-            timeout=30
+            start_new_session=True
         )
-        if result.returncode == 0:
-            update_history(f"✅ Bash execution successful:\n{result.stdout}")
+        try:
+            stdout, stderr = proc.communicate(timeout=BASH_TIMEOUT + 5 if kernel_timeout else BASH_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.communicate(timeout=5)
+            raise
+        # 124 is also an ordinary exit status; only a run that lasted the full
+        # limit was actually stopped by timeout(1)
+        if kernel_timeout and proc.returncode == 124 and time.monotonic() - started >= BASH_TIMEOUT:
+            raise subprocess.TimeoutExpired(argv, BASH_TIMEOUT)
+        if proc.returncode == 0:
+            outcome = f"✅ Bash execution successful:\n{stdout}"
         else:
-            update_history(f"❌ Bash execution failed:\n{result.stderr}")
+            outcome = f"❌ Bash execution failed (exit {proc.returncode}):\n{stderr}"
     except subprocess.TimeoutExpired:
-        update_history("⏰ Bash execution timed out (30s limit)")
+        outcome = f"⏰ Bash execution timed out ({BASH_TIMEOUT}s limit)"
     except Exception as e:
-        update_history(f"❌ Bash execution error: {str(e)}")
+        outcome = f"❌ Bash execution error: {str(e)}"
+    update_history(outcome)
+    record_event(f"Bash execution from {source}", f"{code}\n\n{outcome}")
     
-    pending_bash_code = ""
+    # Keep code that a response extracted while this was running
+    if pending_bash_code == code:
+        pending_bash_code = ""
+    _autonomous_needs_think = True
 
 def run_python_code():
     """Execute pending Python code"""
@@ -316,31 +695,31 @@ def run_python_code():
         update_history("❌ No Python code pending")
         return
     
-    update_history(f"🚀 Executing Python code from {pending_code_source}...")
+    code, source = pending_python_code, pending_code_source
+    update_history(f"🚀 Executing Python code from {source}...")
+    report_python_outcome(code, source, execute_python(code))
+    # Keep code that a response extracted while this was running
+    if pending_python_code == code:
+        pending_python_code = ""
+
+def execute_python(code):
+    """Run code in the Python worker and describe the outcome (safe off the UI thread)"""
     try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(pending_python_code)
-            temp_file = f.name
+        returncode, stdout, stderr = python_worker.run(code)
         
-        result = subprocess.run(
-            ['/usr/bin/python3', temp_file], 
-            capture_output=True, 
-            text=True, 
-            timeout=30
-        )
-        
-        os.unlink(temp_file)
-        
-        if result.returncode == 0:
-            update_history(f"✅ Python execution successful:\n{result.stdout}")
-        else:
-            update_history(f"❌ Python execution failed:\n{result.stderr}")
+        if returncode == 0:
+            return f"✅ Python execution successful:\n{stdout}"
+        return f"❌ Python execution failed (exit {returncode}):\n{stderr}"
     except subprocess.TimeoutExpired:
-        update_history("⏰ Python execution timed out (30s limit)")
+        return "⏰ Python execution timed out (30s limit)"
     except Exception as e:
-        update_history(f"❌ Python execution error: {str(e)}")
-    
-    pending_python_code = ""
+        return f"❌ Python execution error: {str(e)}"
+
+def report_python_outcome(code, source, outcome):
+    global _autonomous_needs_think
+    update_history(outcome)
+    record_event(f"Python execution from {source}", f"{code}\n\n{outcome}")
+    _autonomous_needs_think = True
 
 def clear_pending_code():
     """Clear all pending code"""
@@ -351,26 +730,157 @@ def clear_pending_code():
     pending_code_source = ""
     update_history("🗑️  All pending operations cleared")
 
+def _wrap_line(line):
+    # drop_whitespace=False keeps the indentation of code lines intact
+    return textwrap.wrap(line, width=80, subsequent_indent="  ", drop_whitespace=False) or [""]
+
+# Raw text of the line currently being streamed and how many wrapped rows it
+# occupies at the end of history_lines; reset whenever update_history appends.
+_stream_line = ""
+_stream_rows = 0
+
 def update_history(new_text):
-    global conversation_history
-    wrapped_text = ""
-    for line in new_text.split('\n'):
-        while len(line) > 80:
-            wrapped_text += line[:80] + "\n"
-            line = "  " + line[80:]
-        wrapped_text += line + "\n"
-    conversation_history += wrapped_text
-    history_control.text = conversation_history
-
-def handle_submission(action_type, buffer):
-    global project_state
+    global _rendered, _stream_line, _stream_rows, _history_chars
+    with _history_lock:
+        for line in new_text.split('\n'):
+            wrapped = _wrap_line(line)
+            history_lines.extend(wrapped)
+            _history_chars += sum(len(row) + 1 for row in wrapped)
+        _rendered = None
+        _stream_line, _stream_rows = "", 0
+    app.invalidate()
+
+def stream_history(chunk):
+    """Append a streamed piece of text to the end of the history"""
+    global _rendered, _stream_line, _stream_rows, _history_chars
+    with _history_lock:
+        _history_chars += len(chunk)
+        for i, piece in enumerate(chunk.split('\n')):
+            if i:
+                _stream_line, _stream_rows = "", 0
+            _stream_line += piece
+            # Re-wrap the partial line in place of its previous rows
+            for _ in range(_stream_rows):
+                history_lines.pop()
+            wrapped = _wrap_line(_stream_line)
+            history_lines.extend(wrapped)
+            _stream_rows = len(wrapped)
+        _rendered = None
+    app.invalidate()
+
+def stream_response(header, call, prompt):
+    """Show header, then stream the reply from call(prompt) into the history"""
+    update_history(header)
+    streamed = []
+    def on_chunk(text):
+        streamed.append(text)
+        stream_history(text)
+    output = call(prompt, on_chunk=on_chunk)
+    # Errors come back as a returned message after whatever text already streamed
+    partial = "".join(streamed)
+    if output != partial:
+        update_history(output[len(partial):].lstrip("\n") if output.startswith(partial) else output)
+    return output
+
+def _clip(text, limit=EVENT_CHARS):
+    # Keep both ends: the start says what ran, the end usually says why it failed
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit // 2]}\n...\n{text[-limit // 2:]}"
+
+def remember_turn(entry):
+    """Add an entry to the context window, compacting the oldest half when full"""
+    with _turns_lock:
+        recent_turns.append(entry)
+        compact = len(recent_turns) > RECENT_TURNS and not _compacting_turns
+        if compact:
+            _compacting_turns.extend(recent_turns.popleft() for _ in range(RECENT_TURNS // 2))
+    if compact:
+        asyncio.run_coroutine_threadsafe(compact_turns(), _async_loop)
+
+def record_turn(user_input, action_type, specialist_output):
+    """Remember a finished user turn"""
+    remember_turn(f"User: {user_input}\nResult ({action_type}): {specialist_output}")
+
+def record_event(source, text):
+    """Remember something that happened outside a user turn"""
+    remember_turn(f"[{source}]\n{_clip(text)}")
+
+async def compact_turns():
+    """Fold _compacting_turns into rolling_summary"""
+    global rolling_summary
+    summary_prompt = (
+        "Compress the following conversation into 3 bullet points. Keep goals, decisions and open tasks.\n\n"
+        f"Summary so far:\n{rolling_summary or 'None'}\n\n"
+        "Conversation:\n" + "\n\n".join(_compacting_turns)
+    )
+    summary = await acall_gemini(summary_prompt)
+    with _turns_lock:
+        if summary.startswith("Gemini Error"):
+            # Keep the turns in a truncated raw form rather than dropping them
+            raw = "\n\n".join(turn[:PROJECT_STATE_CHARS] for turn in _compacting_turns)
+            rolling_summary = f"{rolling_summary}\n\n{raw}".strip()[-SUMMARY_FALLBACK_CHARS:]
+        else:
+            rolling_summary = summary
+        _compacting_turns.clear()
+
+def build_conversation_context():
+    """Rolling summary plus the recent turns, as embedded in context prompts"""
+    with _turns_lock:
+        turns = _compacting_turns + list(recent_turns)
+        summary = rolling_summary
+    recent = "\n\n".join(turns) if turns else "No previous turns"
+    return f"Summary of earlier conversation:\n{summary or 'None'}\n\nRecent turns:\n{recent}"
+
+def build_pending_context():
+    """Code that is waiting for the user to run, apply or deny it"""
+    pending = [
+        f"{label} (from {pending_code_source}):\n{code}"
+        for label, code in (("Python", pending_python_code), ("Bash", pending_bash_code), ("Self-modification", pending_self_mod))
+        if code
+    ]
+    return "\n\n".join(pending) if pending else "None"
+
+def build_context_prompt(user_input):
+    """Build the full-context prompt shared by the context_* actions"""
+    return f"Here is our conversation context:\n\n{build_conversation_context()}\n\nPending code awaiting review:\n{build_pending_context()}\n\nAI Memory: {ai_memory}\nLearned Patterns: {recent_patterns(CONTEXT_PATTERNS) if learned_patterns else 'None'}\n\nLatest input: {user_input}\n\nPlease respond based on all context. You can suggest code using @Bash/@EndBash, @Python/@EndPython, or @SelfMod/@EndSelfMod tags."
+
+# Only one submission runs at a time; it runs off the UI thread so the
+# screen keeps redrawing while a response streams in.
+_submission_lock = threading.Lock()
+
+def dispatch_submission(action_type, buffer):
+    """Take the input from buffer and run handle_submission on a worker thread"""
     user_input = buffer.text.strip()
     if not user_input:
         return
-        
+    if not _submission_lock.acquire(blocking=False):
+        update_history("⏳ Still working on the previous request...")
+        return
     buffer.text = ""
     
-    if action_type not in ["context_gemini", "context_gpt", "context_claude"]:
+    def run():
+        try:
+            handle_submission(action_type, user_input)
+        except Exception as e:
+            update_history(f"❌ Error handling request: {str(e)}")
+        finally:
+            _submission_lock.release()
+    threading.Thread(target=run, daemon=True).start()
+
+def format_project_state():
+    """Render project_state for the orchestrator prompt"""
+    if not project_state:
+        return "Project has not started yet. The goal is undefined."
+    return "\n".join(
+        f"[{i}] {entry['user']} ({entry['action']}) -> {entry['result']}"
+        for i, entry in enumerate(project_state)
+    )
+
+def handle_submission(action_type, user_input):
+    # Runs on a worker thread: pending code and agent state are only touched
+    # through post_to_ui, history updates are safe from any thread
+    if action_type not in ["context_gemini", "context_gpt", "context_claude", "broadcast_all_context", "batch_gpt"]:
         update_history(f"\n--- You: {user_input} ---")
 
     specialist_output = ""
@@ -379,12 +889,12 @@ def handle_submission(action_type, buffer):
         update_history("🤖 Orchestrator analyzing...")
         
         ai_memory_summary = str(ai_memory) if ai_memory else "No stored memories"
-        patterns_summary = str(learned_patterns[-3:]) if learned_patterns else "No learned patterns"
-        evolution_summary = str(evolution_log[-2:]) if evolution_log else "No evolution history"
+        patterns_summary = str(recent_patterns(3)) if learned_patterns else "No learned patterns"
+        evolution_summary = str(recent_evolution(2)) if evolution_log else "No evolution history"
         autonomous_status = f"Active with {len(autonomous_task_queue)} queued tasks" if autonomous_mode else "Inactive"
         
-        orchestrator_prompt = ORCHESTRATOR_SYSTEM_PROMPT.format(
-            project_state=project_state, 
+        orchestrator_prompt = build_orchestrator_prompt(
+            project_state=format_project_state(), 
             user_input=user_input,
             ai_memory=ai_memory_summary,
             patterns=patterns_summary,
@@ -393,31 +903,21 @@ def handle_submission(action_type, buffer):
         )
         decision_json_str = call_gemini(orchestrator_prompt)
         
-        json_str = decision_json_str.strip()
-        if json_str.startswith('```json'):
-            json_str = json_str.replace('```json', '').replace('```', '').strip()
-        if json_str.startswith('```'):
-            json_str = json_str.replace('```', '').strip()
-        
         try:
-            decision = json.loads(json_str)
-            action = decision.get("action")
-            prompt = decision.get("prompt")
+            action, prompt = parse_decision(decision_json_str)
 
             if action == "delegate_to_gpt":
                 update_history("🔄 Delegating to GPT-4o...")
-                specialist_output = call_gpt(prompt)
-                update_history(f"🤖 GPT-4o Response:\n{specialist_output}")
-                extract_and_store_code(specialist_output, "GPT-4o")
+                specialist_output = stream_response("🤖 GPT-4o Response:", call_gpt, prompt)
+                post_to_ui(extract_and_store_code, specialist_output, "GPT-4o")
             elif action == "delegate_to_claude":
                 update_history("🔄 Delegating to Claude...")
-                specialist_output = call_claude(prompt)
-                update_history(f"📚 Claude Response:\n{specialist_output}")
-                extract_and_store_code(specialist_output, "Claude")
+                specialist_output = stream_response("📚 Claude Response:", call_claude, prompt)
+                post_to_ui(extract_and_store_code, specialist_output, "Claude")
             else:
                 specialist_output = prompt
                 update_history(f"🎯 Orchestrator Response:\n{specialist_output}")
-                extract_and_store_code(specialist_output, "Orchestrator")
+                post_to_ui(extract_and_store_code, specialist_output, "Orchestrator")
 
         except Exception as e:
             error_msg = f"❌ Error parsing decision: {str(e)}\nRaw output: {decision_json_str}"
@@ -426,68 +926,90 @@ def handle_submission(action_type, buffer):
 
     elif action_type == "force_gpt":
         update_history("⚡ Forcing delegation to GPT-4o...")
-        specialist_output = call_gpt(user_input)
-        update_history(f"🤖 GPT-4o Direct:\n{specialist_output}")
-        extract_and_store_code(specialist_output, "GPT-4o")
+        specialist_output = stream_response("🤖 GPT-4o Direct:", call_gpt, user_input)
+        post_to_ui(extract_and_store_code, specialist_output, "GPT-4o")
         
     elif action_type == "force_claude":
         update_history("⚡ Forcing delegation to Claude...")
-        specialist_output = call_claude(user_input)
-        update_history(f"📚 Claude Direct:\n{specialist_output}")
-        extract_and_store_code(specialist_output, "Claude")
+        specialist_output = stream_response("📚 Claude Direct:", call_claude, user_input)
+        post_to_ui(extract_and_store_code, specialist_output, "Claude")
 
     elif action_type == "request_python":
         prefixed_prompt = f"Create a Python script for: {user_input}\n\nPlease provide the script using @Python and @EndPython tags so it can be executed directly. Make sure the code is complete and ready to run."
         update_history("🐍 Requesting Python script from GPT-4o...")
-        specialist_output = call_gpt(prefixed_prompt)
-        update_history(f"🤖 GPT-4o Python Script:\n{specialist_output}")
-        extract_and_store_code(specialist_output, "GPT-4o")
+        specialist_output = stream_response("🤖 GPT-4o Python Script:", call_gpt, prefixed_prompt)
+        post_to_ui(extract_and_store_code, specialist_output, "GPT-4o")
         
     elif action_type == "request_bash":
         prefixed_prompt = f"Create a Bash script for: {user_input}\n\nPlease provide the script using @Bash and @EndBash tags so it can be executed directly. Make sure the commands are safe and well-commented."
         update_history("🔧 Requesting Bash script from GPT-4o...")
-        specialist_output = call_gpt(prefixed_prompt)
-        update_history(f"🤖 GPT-4o Bash Script:\n{specialist_output}")
-        extract_and_store_code(specialist_output, "GPT-4o")
+        specialist_output = stream_response("🤖 GPT-4o Bash Script:", call_gpt, prefixed_prompt)
+        post_to_ui(extract_and_store_code, specialist_output, "GPT-4o")
 
     elif action_type == "context_gemini":
-        context_prompt = f"Here is our full conversation context:\n\n{conversation_history}\n\nAI Memory: {ai_memory}\nLearned Patterns: {learned_patterns}\n\nLatest input: {user_input}\n\nPlease respond based on all context. You can suggest code using @Bash/@EndBash, @Python/@EndPython, or @SelfMod/@EndSelfMod tags."
+        context_prompt = build_context_prompt(user_input)
         update_history(f"\n--- Sending FULL CONTEXT + AI MEMORY to Gemini ---")
-        specialist_output = call_gemini(context_prompt)
-        update_history(f"🎯 Gemini (Full Context+Memory):\n{specialist_output}")
-        extract_and_store_code(specialist_output, "Gemini")
+        specialist_output = stream_response("🎯 Gemini (Full Context+Memory):", call_gemini, context_prompt)
+        post_to_ui(extract_and_store_code, specialist_output, "Gemini")
         
     elif action_type == "context_gpt":
-        context_prompt = f"Here is our full conversation context:\n\n{conversation_history}\n\nAI Memory: {ai_memory}\nLearned Patterns: {learned_patterns}\n\nLatest input: {user_input}\n\nPlease respond based on all context. You can suggest code using @Bash/@EndBash, @Python/@EndPython, or @SelfMod/@EndSelfMod tags."
+        context_prompt = build_context_prompt(user_input)
         update_history(f"\n--- Sending FULL CONTEXT + AI MEMORY to GPT-4o ---")
-        specialist_output = call_gpt(context_prompt)
-        update_history(f"🤖 GPT-4o (Full Context+Memory):\n{specialist_output}")
-        extract_and_store_code(specialist_output, "GPT-4o")
+        specialist_output = stream_response("🤖 GPT-4o (Full Context+Memory):", call_gpt, context_prompt)
+        post_to_ui(extract_and_store_code, specialist_output, "GPT-4o")
         
     elif action_type == "context_claude":
-        context_prompt = f"Here is our full conversation context:\n\n{conversation_history}\n\nAI Memory: {ai_memory}\nLearned Patterns: {learned_patterns}\n\nLatest input: {user_input}\n\nPlease respond based on all context. You can suggest code using @Bash/@EndBash, @Python/@EndPython, or @SelfMod/@EndSelfMod tags."
+        context_prompt = build_context_prompt(user_input)
         update_history(f"\n--- Sending FULL CONTEXT + AI MEMORY to Claude ---")
-        specialist_output = call_claude(context_prompt)
-        update_history(f"📚 Claude (Full Context+Memory):\n{specialist_output}")
-        extract_and_store_code(specialist_output, "Claude")
+        specialist_output = stream_response("📚 Claude (Full Context+Memory):", call_claude, context_prompt)
+        post_to_ui(extract_and_store_code, specialist_output, "Claude")
 
-    project_state += f"\n\n---\nUser: '{user_input}'\nAction: {action_type}\nResult: {specialist_output}\n---"
+    elif action_type == "broadcast_all_context":
+        context_prompt = build_context_prompt(user_input)
+        update_history(f"\n--- Sending FULL CONTEXT + AI MEMORY to Gemini, GPT-4o and Claude in parallel ---")
+        gemini_output, gpt_output, claude_output = run_async(broadcast_all_context(context_prompt))
+        update_history(f"🎯 Gemini (Full Context+Memory):\n{gemini_output}")
+        post_to_ui(extract_and_store_code, gemini_output, "Gemini")
+        update_history(f"🤖 GPT-4o (Full Context+Memory):\n{gpt_output}")
+        post_to_ui(extract_and_store_code, gpt_output, "GPT-4o")
+        update_history(f"📚 Claude (Full Context+Memory):\n{claude_output}")
+        post_to_ui(extract_and_store_code, claude_output, "Claude")
+        specialist_output = f"Gemini: {gemini_output}\nGPT-4o: {gpt_output}\nClaude: {claude_output}"
+
+    elif action_type == "batch_gpt":
+        context_prompt = build_context_prompt(user_input)
+        update_history(f"\n--- Queueing FULL CONTEXT + AI MEMORY on the GPT-4o Batch API ---")
+        try:
+            batch_id = submit_gpt_batch([context_prompt])
+            update_history(f"📦 Batch {batch_id} submitted; the result will appear here when it completes")
+            asyncio.run_coroutine_threadsafe(poll_gpt_batch(batch_id), _async_loop)
+            specialist_output = f"Submitted OpenAI batch {batch_id}"
+        except Exception as e:
+            specialist_output = f"❌ Could not submit batch: {str(e)}"
+            update_history(specialist_output)
+
+    record_turn(user_input, action_type, specialist_output)
+    project_state.append({
+        "user": user_input[:PROJECT_STATE_CHARS],
+        "action": action_type,
+        "result": specialist_output[:PROJECT_STATE_CHARS]
+    })
     
     # Trigger autonomous agent if active
     if autonomous_mode:
-        autonomous_agent_think()
+        post_to_ui(trigger_autonomous_think)
 
 @kb.add('f1')
 def _(event):
-    handle_submission("orchestrate", event.app.current_buffer)
+    dispatch_submission("orchestrate", event.app.current_buffer)
 
 @kb.add('f2')
 def _(event):
-    handle_submission("force_gpt", event.app.current_buffer)
+    dispatch_submission("force_gpt", event.app.current_buffer)
 
 @kb.add('f3')
 def _(event):
-    handle_submission("force_claude", event.app.current_buffer)
+    dispatch_submission("force_claude", event.app.current_buffer)
 
 @kb.add('f4')
 @kb.add('c-c')
@@ -496,27 +1018,36 @@ def _(event):
 
 @kb.add('1')
 def _(event):
-    handle_submission("context_gemini", event.app.current_buffer)
+    dispatch_submission("context_gemini", event.app.current_buffer)
 
 @kb.add('2')
 def _(event):
-    handle_submission("context_gpt", event.app.current_buffer)
+    dispatch_submission("context_gpt", event.app.current_buffer)
 
 @kb.add('3')
 def _(event):
-    handle_submission("context_claude", event.app.current_buffer)
+    dispatch_submission("context_claude", event.app.current_buffer)
+
+@kb.add('0')
+def _(event):
+    dispatch_submission("broadcast_all_context", event.app.current_buffer)
+
+@kb.add(')')
+def _(event):
+    """Shift-0: Queue full context on the OpenAI Batch API"""
+    dispatch_submission("batch_gpt", event.app.current_buffer)
 
 @kb.add('q')
 @kb.add('Q')
 def _(event):
     """Q: Request Python script"""
-    handle_submission("request_python", event.app.current_buffer)
+    dispatch_submission("request_python", event.app.current_buffer)
 
 @kb.add('w')
 @kb.add('W')
 def _(event):
     """W: Request Bash script"""
-    handle_submission("request_bash", event.app.current_buffer)
+    dispatch_submission("request_bash", event.app.current_buffer)
 
 @kb.add('e')
 @kb.add('E')
@@ -529,6 +1060,7 @@ def _(event):
         autonomous_task_queue.append("Analyze the current system and suggest first improvement")
         autonomous_agent_think()
     else:
+        cancel_autonomous_wakeup()
         update_history("🤖 Autonomous agent deactivated.")
 
 @kb.add('b')
@@ -558,15 +1090,15 @@ def _(event):
     update_history("Current AI Memory: " + str(ai_memory))
     update_history("Learned Patterns: " + str(len(learned_patterns)))
     update_history("Custom Functions: " + str(list(custom_functions.keys())))
-    update_history("Recent Evolution: " + str(evolution_log[-3:] if evolution_log else "None"))
+    update_history("Recent Evolution: " + str(recent_evolution(3) if evolution_log else "None"))
     update_history("Autonomous Mode: " + ("Active" if autonomous_mode else "Inactive"))
     update_history("Queued Tasks: " + str(len(autonomous_task_queue)))
 
 @kb.add('c-l')
 def _(event):
-    global conversation_history
-    conversation_history = "🔄 Screen cleared. AI Orchestrator ready!\n\nF1:Smart | F2:GPT | F3:Claude | F4:Exit\nQ:Python | W:Bash | E:Autonomous | P:RunPy | B:RunBash\n"
-    history_control.text = conversation_history
+    with _history_lock:
+        history_lines.clear()
+    update_history("🔄 Screen cleared. AI Orchestrator ready!\n\nF1:Smart | F2:GPT | F3:Claude | F4:Exit\nQ:Python | W:Bash | E:Autonomous | P:RunPy | B:RunBash\n")
 
 # Layout
 input_buffer = Buffer()
@@ -586,6 +1118,11 @@ app = Application(layout=layout, full_screen=True, key_bindings=kb)
 def main():
     print("Starting AI Orchestrator with Autonomous Agent...")
     load_ai_memory()
+    # Warm up provider connections in the background while the UI starts
+    asyncio.run_coroutine_threadsafe(warmup_clients(), _async_loop)
+    asyncio.run_coroutine_threadsafe(autonomous_worker(), _async_loop)
+    python_worker.start()
+    atexit.register(python_worker.stop)
     
     try:
         app.run()
@@ -1,9 +1,14 @@
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
 def quick_model(df, target):
-    X = df.drop(target, axis=1)
-    y = df[target]
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2)
-    model = LinearRegression().fit(X_train, y_train)
+    # Split row indices rather than frames so the features are only copied once
+    X = df[df.columns.drop(target)].to_numpy(copy=False)
+    y = df[target].to_numpy(copy=False)
+    train_idx, test_idx = train_test_split(np.arange(len(df)), test_size=0.2)
+    X_train, X_test = X[train_idx], X[test_idx]
+    y_train, y_test = y[train_idx], y[test_idx]
+    # X_train is already a private copy, so the model may overwrite it
+    model = LinearRegression(copy_X=False, n_jobs=-1).fit(X_train, y_train)
     return model, X_test, y_test
@@ -1,10 +1,23 @@
 import numpy as np
+from scipy.special import expit
 class SimpleNN:
-    def __init__(self, sizes):
-        self.weights = [np.random.randn(y,x) for x,y in zip(sizes[:-1], sizes[1:])]
-        self.biases = [np.random.randn(y,1) for y in sizes[1:]]
+    def __init__(self, sizes, dtype=np.float32):
+        self.dtype = dtype
+        self.weights = [np.random.randn(y,x).astype(dtype) for x,y in zip(sizes[:-1], sizes[1:])]
+        self.biases = [np.random.randn(y,1).astype(dtype) for y in sizes[1:]]
+        # Activation buffers for the last batch width seen, reused across calls
+        self._buffers, self._batch = [], None
     def feedforward(self, a):
-        for b, w in zip(self.biases, self.weights):
-            a = sigmoid(np.dot(w, a) + b)
-        return a
-def sigmoid(z): return 1.0/(1.0+np.exp(-z))
+        # a is (n_inputs, batch): one column per sample, so each layer is a single GEMM
+        a = np.asarray(a, dtype=self.dtype)
+        if a.ndim == 1: a = a.reshape(-1, 1)
+        if a.shape[1] != self._batch:
+            self._buffers = [np.empty((w.shape[0], a.shape[1]), dtype=self.dtype) for w in self.weights]
+            self._batch = a.shape[1]
+        for b, w, buf in zip(self.biases, self.weights, self._buffers):
+            np.dot(w, a, out=buf)
+            buf += b
+            a = sigmoid(buf, out=buf)
+        # Copy so the caller's result is not overwritten by the next call
+        return a.copy()
+def sigmoid(z, out=None): return expit(z, out=out)
@@ -0,0 +1,202 @@
+# python_worker.py
+import json
+import os
+import select
+import signal
+import struct
+import subprocess
+import threading
+import time
+
+PYTHON_EXECUTABLE = "/usr/bin/python3"
+
+# Runs inside the worker interpreter. The protocol uses its own pipe fds
+# (passed as arguments): a 4-byte big-endian length followed by the payload,
+# UTF-8 code in and a JSON result out.
+WORKER_SOURCE = r'''
+import json, os, signal, struct, sys, tempfile, traceback
+
+timeout = int(sys.argv[1])
+proto_in = os.fdopen(int(sys.argv[2]), "rb", buffering=0)
+proto_out = os.fdopen(int(sys.argv[3]), "wb", buffering=0)
+# Processes started by snippets must not hold the protocol pipes open
+os.set_inheritable(proto_in.fileno(), False)
+os.set_inheritable(proto_out.fileno(), False)
+null_fd = os.open(os.devnull, os.O_RDWR)
+start_cwd = os.getcwd()
+
+class Timeout(BaseException):
+    pass
+
+def on_alarm(signum, frame):
+    raise Timeout()
+
+signal.signal(signal.SIGALRM, on_alarm)
+
+def read_exact(n):
+    buf = b""
+    while len(buf) < n:
+        chunk = proto_in.read(n - len(buf))
+        if not chunk:
+            return None
+        buf += chunk
+    return buf
+
+while True:
+    header = read_exact(4)
+    if header is None:
+        break
+    code = read_exact(struct.unpack(">I", header)[0]).decode("utf-8")
+    result = {"returncode": 0, "timed_out": False}
+    # Run from a real file, as a script would: __file__, argv[0], path[0] and
+    # tracebacks with source lines all work
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as f:
+        f.write(code)
+        script = f.name
+    # Process-wide state a snippet may change; restored after it finishes
+    saved = (os.getcwd(), list(sys.argv), list(sys.path), sys.stdout, sys.stderr)
+    sys.argv = [script]
+    sys.path[0] = os.path.dirname(script)
+    # Point fds 1/2 at temp files for this snippet so output written by the
+    # processes it spawns (and by C code) is captured too, not just print()
+    out_f, err_f = tempfile.TemporaryFile(), tempfile.TemporaryFile()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.dup2(out_f.fileno(), 1)
+    os.dup2(err_f.fileno(), 2)
+    try:
+        signal.alarm(timeout)
+        try:
+            exec(compile(code, script, "exec"), {"__name__": "__main__", "__file__": script})
+        finally:
+            signal.alarm(0)
+    except Timeout:
+        result["returncode"] = -1
+        result["timed_out"] = True
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            result["returncode"] = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            result["returncode"] = 1
+    except BaseException:
+        traceback.print_exc()
+        result["returncode"] = 1
+    finally:
+        cwd, sys.argv, sys.path[:], sys.stdout, sys.stderr = saved
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(null_fd, 1)
+        os.dup2(null_fd, 2)
+        try:
+            os.chdir(cwd)
+        except OSError:
+            # The snippet removed it; fall back to where the worker started
+            os.chdir(start_cwd)
+        os.unlink(script)
+    for key, f in (("stdout", out_f), ("stderr", err_f)):
+        f.seek(0)
+        result[key] = f.read().decode("utf-8", "replace")
+        f.close()
+    frame = json.dumps(result).encode("utf-8")
+    proto_out.write(struct.pack(">I", len(frame)) + frame)
+'''
+
+class PythonWorker:
+    """A long-running Python interpreter that executes code sent over a pipe.
+
+    Avoids paying interpreter start-up and a temp-file round-trip for every
+    snippet. Each snippet runs from its own temp file in a fresh globals
+    dict; cwd, sys.argv, sys.path and sys.stdout/stderr are restored
+    afterwards, but imported modules and the environment persist.
+    """
+
+    def __init__(self, python=PYTHON_EXECUTABLE, timeout=30):
+        self.python = python
+        self.timeout = timeout
+        self._proc = None
+        self._to_worker = None
+        self._from_worker = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Spawn the worker process if it is not already running"""
+        if self._proc is None or self._proc.poll() is not None:
+            self.stop()
+            code_r, self._to_worker = os.pipe()
+            self._from_worker, result_w = os.pipe()
+            try:
+                self._proc = subprocess.Popen(
+                    [self.python, '-u', '-c', WORKER_SOURCE, str(self.timeout), str(code_r), str(result_w)],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    pass_fds=(code_r, result_w),
+                    # Own process group, so stop() also kills anything the code spawned
+                    start_new_session=True
+                )
+            finally:
+                # The worker has its own copies; closing ours lets EOF reach us if it dies
+                os.close(code_r)
+                os.close(result_w)
+
+    def stop(self):
+        """Terminate the worker process and everything it started"""
+        proc, self._proc = self._proc, None
+        if proc is not None:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            proc.wait()
+        for fd in (self._to_worker, self._from_worker):
+            if fd is not None:
+                os.close(fd)
+        self._to_worker = self._from_worker = None
+
+    def run(self, code):
+        """Execute code in the worker and return (returncode, stdout, stderr).
+
+        Raises subprocess.TimeoutExpired if the code runs past the timeout.
+        """
+        with self._lock:
+            self.start()
+            payload = code.encode("utf-8")
+            try:
+                self._write_all(struct.pack(">I", len(payload)) + payload)
+                # Give the in-worker alarm a moment to fire before giving up on it
+                deadline = time.monotonic() + self.timeout + 5
+                header = self._read_exact(4, deadline)
+                result = json.loads(self._read_exact(struct.unpack(">I", header)[0], deadline))
+            except subprocess.TimeoutExpired:
+                self.stop()
+                raise
+            except (BrokenPipeError, EOFError):
+                self.stop()
+                raise RuntimeError("Python worker exited unexpectedly")
+
+            if result["timed_out"]:
+                # Restart rather than leave behind processes the code started
+                self.stop()
+                raise subprocess.TimeoutExpired(self.python, self.timeout)
+        return result["returncode"], result["stdout"], result["stderr"]
+
+    def _write_all(self, data):
+        while data:
+            data = data[os.write(self._to_worker, data):]
+
+    def _read_exact(self, n, deadline):
+        fd = self._from_worker
+        buf = b""
+        while len(buf) < n:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(self.python, self.timeout)
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(fd, n - len(buf))
+            if not chunk:
+                raise EOFError
+            buf += chunk
+        return buf